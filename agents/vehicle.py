@@ -728,13 +728,16 @@ class VehicleAgent(Agent):
     
     def get_state(self) -> Dict[str, Any]:
         """Get current state as dictionary."""
-        return {
-            'id': self.unique_id,
-            'position': self.position,
-            'battery_level': self.battery_level,
-            'status': self.status.value,
-            'target_station': self.target_station,
-            'path_length': len(self.path) - self.path_index if self.path else 0,
-            'total_distance': self.total_distance,
-            'num_replans': self.num_replans,
-        }
\ No newline at end of file
+        return self.write_state({})
+    
+    def write_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Write current state into an existing dictionary (reused across ticks) and return it."""
+        state['id'] = self.unique_id
+        state['position'] = self.position
+        state['battery_level'] = self.battery_level
+        state['status'] = self.status.value
+        state['target_station'] = self.target_station
+        state['path_length'] = len(self.path) - self.path_index if self.path else 0
+        state['total_distance'] = self.total_distance
+        state['num_replans'] = self.num_replans
+        return state
\ No newline at end of file
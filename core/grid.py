@@ -100,6 +100,23 @@ class Grid:
             return station
         raise ValueError(f"Invalid position: ({x}, {y})")
     
+    def add_charging_stations(self, specs: List[Tuple[int, int, int]]) -> List[ChargingStation]:
+        """Add several charging stations from (x, y, capacity) specs in one pass."""
+        cells = []
+        for x, y, _ in specs:
+            cell = self.get_cell(x, y)
+            if cell is None:
+                raise ValueError(f"Invalid position: ({x}, {y})")
+            cells.append(cell)
+        
+        next_id = len(self.charging_stations)
+        stations = []
+        for cell, (x, y, capacity) in zip(cells, specs):
+            cell.cell_type = CellType.CHARGING_STATION
+            stations.append(ChargingStation(next_id + len(stations), (x, y), capacity))
+        self.charging_stations.extend(stations)
+        return stations
+    
     def set_exit(self, x: int, y: int):
         """Set exit position for vehicles to leave."""
         if self.is_valid_position(x, y):
@@ -1,7 +1,9 @@
 import sys
 import uvicorn
 from colorama import init, Fore, Style
-from web.server import app
+from web.server import (
+    app, SERVER_LOOP, SERVER_HTTP, SERVER_WS, SERVER_WS_DEFLATE, SERVER_WS_MAX_SIZE
+)
 
 # Initialize colorama for colored terminal output
 init()
@@ -26,7 +28,17 @@ def main():
     
     try:
         # Import and run the FastAPI app
-        uvicorn.run(app, host=host, port=port, log_level="info")
+        uvicorn.run(
+            app,
+            host=host,
+            port=port,
+            log_level="warning",  # Per-request access logs would compete with the WebSocket loop
+            loop=SERVER_LOOP,
+            http=SERVER_HTTP,
+            ws=SERVER_WS,
+            ws_per_message_deflate=SERVER_WS_DEFLATE,
+            ws_max_size=SERVER_WS_MAX_SIZE
+        )
     except KeyboardInterrupt:
         print()
         print(Fore.YELLOW + "\nServer stopped by user" + Style.RESET_ALL)
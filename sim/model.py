@@ -1,4 +1,6 @@
-from typing import List, Tuple, Dict, Any, Optional, Type
+from typing import List, Tuple, Dict, Any, Optional, Type, Deque
+from collections import deque
+from itertools import count
 import random
 from mesa import Model, Agent
 from mesa.time import BaseScheduler
@@ -63,6 +65,9 @@ class ChargingSimulationModel(Model):
     - Metrics collection
     """
     
+    # Log sequence numbers, unique across models so clients can dedupe entries after a reset
+    _log_seq = count(1)
+    
     def __init__(
         self,
         grid: Grid,
@@ -112,6 +117,9 @@ class ChargingSimulationModel(Model):
         
         # Environment
         self.grid = grid
+        # Grid layout is fixed for a run; vehicles are reported separately in get_state.
+        # Cells are sent as one byte each, row-major (0 = empty, 1 = obstacle, 2 = charging station)
+        self.grid_cells = grid.to_array().astype('uint8').tobytes()
         self.reservation_table = ReservationTable()
         
         # Metrics
@@ -121,11 +129,12 @@ class ChargingSimulationModel(Model):
         self.message_queue: List[Any] = []
         
         # Agent activity logs for visualization
-        self.activity_logs: List[Dict[str, str]] = []
+        self.activity_logs: List[Dict[str, Any]] = []
         
-        self.vehicle_trails: Dict[str, List[Tuple[int, int]]] = {}
         self.max_trail_length = 50  # Increased to show more of the path
-        self.vehicle_states: Dict[str, Dict] = {}
+        self.vehicle_trails: Dict[str, Deque[Tuple[int, int]]] = {}  # Bounded, oldest positions drop off the left
+        self.vehicle_states: Dict[str, Dict] = {}  # Per-vehicle state dicts, updated in place by get_state
+        self.station_states: List[Dict[str, Any]] = []  # Per-station state dicts, aligned with grid.charging_stations
         self.schedule = OrderedScheduler(self)
         self.orchestrator = orchestrator_class("orchestrator", self)
         self.schedule.add(self.orchestrator)
@@ -179,6 +188,8 @@ class ChargingSimulationModel(Model):
             self.schedule.remove(vehicle)
             del self.vehicles[vehicle_id]
             
+            self.vehicle_states.pop(vehicle_id, None)
+            
             # Clean up reservations
             self.reservation_table.release_all(vehicle_id)
     
@@ -240,6 +251,7 @@ class ChargingSimulationModel(Model):
     def log_activity(self, agent: str, message: str, log_type: str = "info"):
         """Log agent activity for visualization."""
         self.activity_logs.append({
+            "seq": next(self._log_seq),
             "agent": agent,
             "message": message,
             "type": log_type
@@ -253,36 +265,35 @@ class ChargingSimulationModel(Model):
             Dictionary containing full simulation state
         """
         vehicle_states_list = []
-        vehicle_positions = {}
         
         for vehicle_id, vehicle in self.vehicles.items():
-            state = vehicle.get_state()
+            state = self.vehicle_states.get(vehicle_id)
+            if state is None:
+                state = self.vehicle_states[vehicle_id] = {}
+            vehicle.write_state(state)
             state['current_path'] = vehicle.path if vehicle.path else []
             state['path_index'] = vehicle.path_index
             state['trail'] = self.vehicle_trails.get(vehicle_id, [])
             vehicle_states_list.append(state)
-            vehicle_positions[vehicle.position] = vehicle_id
-            self.vehicle_states[vehicle_id] = state
             
             # Update trail
             if vehicle_id not in self.vehicle_trails:
-                self.vehicle_trails[vehicle_id] = []
+                self.vehicle_trails[vehicle_id] = deque(maxlen=self.max_trail_length)
             trail = self.vehicle_trails[vehicle_id]
             if not trail or trail[-1] != vehicle.position:
                 trail.append(vehicle.position)
-                if len(trail) > self.max_trail_length:
-                    trail.pop(0)
         
-        # Get station states
-        station_states = []
-        for station in self.grid.charging_stations:
-            station_states.append({
+        # Get station states; static fields are filled in once per station
+        stations = self.grid.charging_stations
+        for station in stations[len(self.station_states):]:
+            self.station_states.append({
                 'id': station.station_id,
                 'position': station.position,
                 'capacity': station.capacity,
-                'occupied': len(station.occupied_slots),
-                'load': station.get_load(),
             })
+        for station, state in zip(stations, self.station_states):
+            state['occupied'] = len(station.occupied_slots)
+            state['load'] = station.get_load()
         
         # Get orchestrator state
         orchestrator_state = self.orchestrator.get_state()
@@ -293,9 +304,11 @@ class ChargingSimulationModel(Model):
             'scenario_description': self.scenario_description,
             'step_delay': self.step_delay,
             'vehicles': vehicle_states_list,
-            'stations': station_states,
+            'stations': self.station_states,
             'orchestrator': orchestrator_state,
-            'grid_string': self.grid.to_string(vehicle_positions),
+            'grid_width': self.grid.width,
+            'grid_height': self.grid.height,
+            'grid_cells': self.grid_cells,
             'grid_exit': self.grid.exit_position,  # Add exit position
             'metrics_summary': self.metrics.get_summary(),
             'logs': self.activity_logs,  # Include activity logs
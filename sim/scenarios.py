@@ -1,15 +1,27 @@
+import sys
 from typing import Tuple, List, Dict, Any, Optional
 from dataclasses import dataclass
 from core.grid import Grid
 
+# Shared vehicle id strings for metadata; ids past the table are formatted on demand
+_VEHICLE_IDS = tuple(sys.intern(f'vehicle_{i}') for i in range(32))
+
+
+def _vehicle_id(index: int) -> str:
+    """Return the vehicle id for a scenario vehicle index."""
+    if index < len(_VEHICLE_IDS):
+        return _VEHICLE_IDS[index]
+    return f'vehicle_{index}'
+
+
 @dataclass
 class ScenarioConfig:
     """Simulation scenario configuration."""
     name: str
     description: str
     grid: Grid
-    vehicle_positions: List[Tuple[int, int]]
-    vehicle_batteries: List[float]
+    vehicle_positions: Tuple[Tuple[int, int], ...]
+    vehicle_batteries: Tuple[float, ...]
     expected_outcome: str
     step_delay: float = 0.5
     
@@ -22,11 +34,11 @@ class ScenarioConfig:
             'num_stations': len(self.grid.charging_stations),
             'vehicle_configs': [
                 {
-                    'id': f'vehicle_{i}',
+                    'id': _vehicle_id(i),
                     'position': pos,
-                    'battery': self.vehicle_batteries[i]
+                    'battery': battery
                 }
-                for i, pos in enumerate(self.vehicle_positions)
+                for i, (pos, battery) in enumerate(zip(self.vehicle_positions, self.vehicle_batteries))
             ],
             'station_configs': [
                 {
@@ -42,6 +54,13 @@ class ScenarioConfig:
         }
 
 
+_DESC_SIMPLE_1 = """Single vehicle charging demonstration.
+        
+        1 vehicle at (12,1) with 25% battery requests charging.
+        Orchestrator assigns optimal station based on distance.
+        Vehicle navigates, charges to 95%, and exits at (0,11)."""
+
+
 def create_standard_simple_1_agent() -> ScenarioConfig:
     """Baseline scenario: single vehicle charging cycle with orchestrator communication."""
     grid_str = """
@@ -61,21 +80,16 @@ def create_standard_simple_1_agent() -> ScenarioConfig:
     
     grid = Grid.from_string(grid_str)
     
-    grid.add_charging_station(5, 5, capacity=2)
-    grid.add_charging_station(10, 6, capacity=2)
+    grid.add_charging_stations([(5, 5, 2), (10, 6, 2)])
     
     grid.set_exit(0, 11)
     
-    vehicle_positions = [(12, 1)]
-    vehicle_batteries = [25.0] 
+    vehicle_positions = ((12, 1),)
+    vehicle_batteries = (25.0,)
     
     return ScenarioConfig(
         name="Standard - Simple 1 Agent",
-        description="""Single vehicle charging demonstration.
-        
-        1 vehicle at (12,1) with 25% battery requests charging.
-        Orchestrator assigns optimal station based on distance.
-        Vehicle navigates, charges to 95%, and exits at (0,11).""",
+        description=_DESC_SIMPLE_1,
         grid=grid,
         vehicle_positions=vehicle_positions,
         vehicle_batteries=vehicle_batteries,
@@ -84,6 +98,13 @@ def create_standard_simple_1_agent() -> ScenarioConfig:
     )
 
 
+_DESC_MULTIPLE = """3 vehicles request charging simultaneously.
+        
+        Orchestrator assigns each to nearest available station.
+        All vehicles navigate and charge concurrently.
+        Path overlaps are acceptable in this scenario."""
+
+
 def create_multiple_agents_concurrent() -> ScenarioConfig:
     """Multiple vehicles requesting charging concurrently."""
     grid_str = """
@@ -106,22 +127,16 @@ def create_multiple_agents_concurrent() -> ScenarioConfig:
     
     grid = Grid.from_string(grid_str)
     
-    grid.add_charging_station(5, 5, capacity=1)
-    grid.add_charging_station(14, 5, capacity=1)
-    grid.add_charging_station(10, 12, capacity=1)
+    grid.add_charging_stations([(5, 5, 1), (14, 5, 1), (10, 12, 1)])
     
     grid.set_exit(0, 14)
     
-    vehicle_positions = [(2, 2), (17, 2), (10, 8)]
-    vehicle_batteries = [28.0, 26.0, 24.0]
+    vehicle_positions = ((2, 2), (17, 2), (10, 8))
+    vehicle_batteries = (28.0, 26.0, 24.0)
     
     return ScenarioConfig(
         name="Multiple Agents - Concurrent Charging",
-        description="""3 vehicles request charging simultaneously.
-        
-        Orchestrator assigns each to nearest available station.
-        All vehicles navigate and charge concurrently.
-        Path overlaps are acceptable in this scenario.""",
+        description=_DESC_MULTIPLE,
         grid=grid,
         vehicle_positions=vehicle_positions,
         vehicle_batteries=vehicle_batteries,
@@ -130,6 +145,13 @@ def create_multiple_agents_concurrent() -> ScenarioConfig:
     )
 
 
+_DESC_PATH_CONFLICT = """2 vehicles on row 2 moving toward center in narrow corridor.
+        
+        vehicle_0 at (0,2) moves RIGHT to Station_0 at (2,2).
+        vehicle_1 at (8,2) moves LEFT to Station_1 at (6,2).
+        Priority-based collision avoidance: lower ID has priority."""
+
+
 def create_path_conflict_scenario() -> ScenarioConfig:
     """Priority-based head-on collision avoidance in narrow corridor."""
     grid_str = """.........
@@ -145,21 +167,16 @@ def create_path_conflict_scenario() -> ScenarioConfig:
     
     grid = Grid.from_string(grid_str)
     
-    grid.add_charging_station(2, 2, capacity=1)
-    grid.add_charging_station(6, 2, capacity=1)
+    grid.add_charging_stations([(2, 2, 1), (6, 2, 1)])
     
     grid.set_exit(4, 9)
     
-    vehicle_positions = [(0, 2), (8, 2)]
-    vehicle_batteries = [26.0, 26.0]
+    vehicle_positions = ((0, 2), (8, 2))
+    vehicle_batteries = (26.0, 26.0)
     
     return ScenarioConfig(
         name="Path Conflict - Head-On Avoidance",
-        description="""2 vehicles on row 2 moving toward center in narrow corridor.
-        
-        vehicle_0 at (0,2) moves RIGHT to Station_0 at (2,2).
-        vehicle_1 at (8,2) moves LEFT to Station_1 at (6,2).
-        Priority-based collision avoidance: lower ID has priority.""",
+        description=_DESC_PATH_CONFLICT,
         grid=grid,
         vehicle_positions=vehicle_positions,
         vehicle_batteries=vehicle_batteries,
@@ -168,34 +185,26 @@ def create_path_conflict_scenario() -> ScenarioConfig:
     )
 
 
+_DESC_CONTENTION = """3 vehicles compete for 1 charging station (capacity 1).
+        
+        Orchestrator assigns based on distance and battery urgency.
+        Vehicles queue sequentially: only 1 charges at a time.
+        Optimizes assignment order to minimize total wait time."""
+
+
 def create_station_contention_scenario() -> ScenarioConfig:
     """Queue management when multiple vehicles compete for limited station capacity."""
-    grid_str = """............
-............
-............
-............
-............
-............
-............
-............
-............
-............"""
-    
-    grid = Grid.from_string(grid_str)
+    grid = Grid(12, 10)
     
     grid.add_charging_station(6, 4, capacity=1)
     grid.set_exit(6, 9)
     
-    vehicle_positions = [(3, 1), (10, 1), (6, 7)]
-    vehicle_batteries = [28.0, 26.0, 24.0]
+    vehicle_positions = ((3, 1), (10, 1), (6, 7))
+    vehicle_batteries = (28.0, 26.0, 24.0)
     
     return ScenarioConfig(
         name="Station Contention - Resource Allocation",
-        description="""3 vehicles compete for 1 charging station (capacity 1).
-        
-        Orchestrator assigns based on distance and battery urgency.
-        Vehicles queue sequentially: only 1 charges at a time.
-        Optimizes assignment order to minimize total wait time.""",
+        description=_DESC_CONTENTION,
         grid=grid,
         vehicle_positions=vehicle_positions,
         vehicle_batteries=vehicle_batteries,
@@ -204,37 +213,27 @@ def create_station_contention_scenario() -> ScenarioConfig:
     )
 
 
+_DESC_NEGOTIATION = """2 vehicles negotiate queue order based on urgency.
+        
+        Initial: vehicle_0 (closer) gets pos 0, vehicle_1 (farther) gets pos 1.
+        Negotiation: vehicle_1 has critical battery (15%), requests priority.
+        Final: vehicle_1 moves to pos 0, vehicle_0 accepts pos 1.
+        Execution: vehicle_1 charges first, vehicle_0 waits."""
+
+
 def create_negotiation_scenario() -> ScenarioConfig:
     """Queue-based negotiation where urgent robot requests priority."""
-    grid_str = """...............
-...............
-...............
-...............
-...............
-...............
-...............
-...............
-...............
-...............
-...............
-..............."""
-    
-    grid = Grid.from_string(grid_str)
+    grid = Grid(15, 12)
     
     grid.add_charging_station(6, 4, capacity=1)
     grid.set_exit(0, 11)
     
-    vehicle_positions = [(2, 2), (10, 2)]
-    vehicle_batteries = [25.0, 15.0]
+    vehicle_positions = ((2, 2), (10, 2))
+    vehicle_batteries = (25.0, 15.0)
     
     return ScenarioConfig(
         name="Queue Negotiation: 2 Robots, 1 Station",
-        description="""2 vehicles negotiate queue order based on urgency.
-        
-        Initial: vehicle_0 (closer) gets pos 0, vehicle_1 (farther) gets pos 1.
-        Negotiation: vehicle_1 has critical battery (15%), requests priority.
-        Final: vehicle_1 moves to pos 0, vehicle_0 accepts pos 1.
-        Execution: vehicle_1 charges first, vehicle_0 waits.""",
+        description=_DESC_NEGOTIATION,
         grid=grid,
         vehicle_positions=vehicle_positions,
         vehicle_batteries=vehicle_batteries,
@@ -243,30 +242,7 @@ def create_negotiation_scenario() -> ScenarioConfig:
     )
 
 
-def create_tit_for_tat_scenario() -> ScenarioConfig:
-    """Tit-for-Tat behavioral negotiation with cooperative, competitive, and adaptive strategies."""
-    grid_str = """............
-............
-............
-............
-............
-............
-............
-............
-............
-............"""
-    
-    grid = Grid.from_string(grid_str)
-    
-    grid.add_charging_station(6, 5, capacity=1)
-    grid.set_exit(6, 9)
-    
-    vehicle_positions = [(3, 5), (9, 5), (6, 2)]
-    vehicle_batteries = [22.0, 22.0, 22.0]
-    
-    return ScenarioConfig(
-        name="Tit-for-Tat: Behavioral Learning",
-        description="""3 robots with different strategies compete for 1 station.
+_DESC_TIT_FOR_TAT = """3 robots with different strategies compete for 1 station.
 
 STRATEGIES:
 • vehicle_0 (COOPERATIVE): Always accepts assignments, gets exploited
@@ -287,7 +263,22 @@ EXPECTED DYNAMICS:
 • Cooperative: Exploited, waits longest
 • Competitive: Wins early, faces retaliation
 • TFT: Learns patterns, achieves balance
-• Multiple negotiation rounds demonstrate adaptation""",
+• Multiple negotiation rounds demonstrate adaptation"""
+
+
+def create_tit_for_tat_scenario() -> ScenarioConfig:
+    """Tit-for-Tat behavioral negotiation with cooperative, competitive, and adaptive strategies."""
+    grid = Grid(12, 10)
+    
+    grid.add_charging_station(6, 5, capacity=1)
+    grid.set_exit(6, 9)
+    
+    vehicle_positions = ((3, 5), (9, 5), (6, 2))
+    vehicle_batteries = (22.0, 22.0, 22.0)
+    
+    return ScenarioConfig(
+        name="Tit-for-Tat: Behavioral Learning",
+        description=_DESC_TIT_FOR_TAT,
         grid=grid,
         vehicle_positions=vehicle_positions,
         vehicle_batteries=vehicle_batteries,
@@ -1,35 +1,187 @@
 import asyncio
+import logging
+import math
+import sys
+import zlib
+import orjson
+import ormsgpack
 import uvicorn
-from typing import Dict, Optional, Set
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi.responses import RedirectResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 
 from sim.model import ChargingSimulationModel
 from sim.scenarios import get_scenario, list_scenarios
 
-# Global state
-simulation_model: Optional[ChargingSimulationModel] = None
-simulation_running = False
-simulation_paused = False
-simulation_speed = 2.0
-active_connections: Set[WebSocket] = set()
+logger = logging.getLogger(__name__)
+
+# The browser page (index.html) lives next to this module
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+# Smallest HTTP response body worth gzipping
+GZIP_MIN_SIZE = 1024
+
+# MessagePack options for state frames (numpy values, int-keyed metric dicts)
+STATE_PACK_OPTIONS = ormsgpack.OPT_SERIALIZE_NUMPY | ormsgpack.OPT_NON_STR_KEYS
+
+# Fields that move on every read or every tick (wall-clock time, tick counters); a state
+# whose only differences are these is sent at most once per VOLATILE_REFRESH_INTERVAL
+# seconds, so the page's tick and clock keep moving while nothing else happens
+VOLATILE_FIELDS = frozenset({'tick'})
+VOLATILE_METRICS = frozenset({'simulation_time', 'total_ticks'})
+VOLATILE_REFRESH_INTERVAL = 1.0
+
+# Event loop / protocol implementations for uvicorn (uvicorn[standard] ships uvloop everywhere except Windows)
+SERVER_LOOP = "asyncio" if sys.platform == "win32" else "uvloop"
+SERVER_HTTP = "httptools"
+SERVER_WS = "websockets"
+
+# Frames are zlib-compressed once in encode_state and shared by every client, so
+# per-connection permessage-deflate would only compress them again; cap inbound size
+SERVER_WS_DEFLATE = False
+SERVER_WS_MAX_SIZE = 16 * 1024 * 1024
+
+# zlib level for state frames (fast: they are rebuilt every tick)
+FRAME_COMPRESS_LEVEL = 1
+
+# Playback multipliers accepted from clients (the page's speed slider range)
+MIN_SPEED = 0.25
+MAX_SPEED = 4.0
+
+# Frames buffered per client before the oldest pending one is dropped
+CLIENT_QUEUE_SIZE = 2
+
+# Clients handed a frame before broadcast_state yields to the event loop
+BROADCAST_BATCH_SIZE = 50
+
+
+@dataclass
+class ClientChannel:
+    """Outbound frame queue for one WebSocket connection."""
+    ws: WebSocket
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE))
+    relay_task: Optional[asyncio.Task] = None
+    needs_snapshot: bool = True  # Patches are useless until the client holds a full state
+    
+    def push(self, payload: bytes):
+        """Queue a frame, dropping the oldest pending one if the client is behind."""
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.queue.get_nowait()
+            self.queue.put_nowait(payload)
+    
+    def reset_to(self, snapshot: bytes):
+        """Discard pending frames and queue a full snapshot in their place."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(snapshot)
+        self.needs_snapshot = False
+
+
+@dataclass
+class SimState:
+    """Simulation and connection state shared by the handlers, stored on app.state.sim."""
+    model: Optional[ChargingSimulationModel] = None
+    running: bool = False
+    speed: float = 1.0  # Playback multiplier applied to the scenario's step delay
+    step_delay: float = 0.3  # Seconds between ticks, resolved when a model is created
+    connections: Dict[WebSocket, ClientChannel] = field(default_factory=dict)
+    _channels: Optional[Tuple[ClientChannel, ...]] = field(default=None, init=False, repr=False)
+    last_state: Optional[dict] = None  # Copy of the state sent by the previous broadcast
+    seq: int = 0  # Sequence number of the frame that carried last_state
+    snapshot: Optional[bytes] = None  # Encoded snapshot of last_state, see current_snapshot
+    snapshot_seq: int = -1
+    last_frame_at: float = 0.0  # Event loop time of the previous broadcast frame
+    resume_event: asyncio.Event = field(default_factory=asyncio.Event)  # Cleared while paused
+    broadcast_lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # Serializes broadcast_state
+    model_lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # Held while the model is stepped, mutated or read
+    
+    def __post_init__(self):
+        self.resume_event.set()
+    
+    def apply_speed(self, speed: float):
+        """
+        Set the playback multiplier and rescale the tick delay for the current model.
+        
+        The speed comes from clients: it is clamped to [MIN_SPEED, MAX_SPEED], and
+        values that are not finite numbers are logged and ignored.
+        """
+        try:
+            value = float(speed)
+        except (TypeError, ValueError):
+            value = math.nan
+        if not math.isfinite(value):
+            logger.warning("Ignoring invalid speed %r", speed)
+            return
+        self.speed = min(max(value, MIN_SPEED), MAX_SPEED)
+        if self.model:
+            self.step_delay = getattr(self.model, 'step_delay', 0.3) / self.speed
+    
+    def current_snapshot(self) -> Optional[bytes]:
+        """Encoded snapshot of last_state, built at most once per broadcast and shared by all clients."""
+        if self.last_state is None:
+            return None
+        if self.snapshot_seq != self.seq:
+            self.snapshot = encode_snapshot(self.last_state, self.seq)
+            self.snapshot_seq = self.seq
+        return self.snapshot
+    
+    @property
+    def channels(self) -> Tuple[ClientChannel, ...]:
+        """Snapshot of connections.values() for broadcasting, rebuilt only after the set changed."""
+        if self._channels is None:
+            self._channels = tuple(self.connections.values())
+        return self._channels
+    
+    def add_channel(self, channel: ClientChannel):
+        """Register a connection; O(1), the broadcast snapshot is rebuilt lazily."""
+        self.connections[channel.ws] = channel
+        self._channels = None
+    
+    def remove_channel(self, ws: WebSocket):
+        """Unregister a connection (no-op if already gone)."""
+        if self.connections.pop(ws, None) is not None:
+            self._channels = None
+
+
+async def relay(channel: ClientChannel):
+    """Forward queued frames to the client until the connection fails."""
+    try:
+        while True:
+            payload = await channel.queue.get()
+            await channel.ws.send_bytes(payload)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        app.state.sim.remove_channel(channel.ws)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager."""
+    app.state.sim = SimState()
     yield
-    for ws in list(active_connections):
+    for ws in list(app.state.sim.connections):
         await ws.close()
 
 
 app = FastAPI(lifespan=lifespan)
+# Page and assets are plain files: StaticFiles answers conditional GETs (ETag/If-None-Match),
+# and responses above the threshold are gzipped on the way out
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
 
 
 @app.get("/")
 async def get():
-    """Serve the main HTML page."""
-    return HTMLResponse(HTML_TEMPLATE)
+    """Redirect to the main HTML page."""
+    return RedirectResponse("/static/index.html")
 
 
 @app.get("/api/scenarios")
@@ -41,36 +193,51 @@ async def get_scenarios():
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication."""
+    sim = app.state.sim
     await websocket.accept()
-    active_connections.add(websocket)
+    channel = ClientChannel(websocket)
+    channel.relay_task = asyncio.create_task(relay(channel))
+    sim.add_channel(channel)
     
     try:
-        # Send initial state
-        if simulation_model:
-            state = simulation_model.get_state()
-            await websocket.send_json(state)
-        
-        # Handle incoming messages
+        # Send initial state; later patches are diffed against last_state. Under
+        # broadcast_lock, so the snapshot's seq and state can't be split by a broadcast.
+        async with sim.broadcast_lock:
+            if sim.last_state is not None:
+                channel.reset_to(sim.current_snapshot())
+            elif sim.model:
+                # Nothing broadcast since the model was created: broadcast now, which
+                # records last_state and hands every client (this one included) a snapshot
+                await _broadcast_state(sim, droppable=False)
+        
+        # Handle incoming messages: MessagePack binary frames, or JSON text from simpler clients
         while True:
-            data = await websocket.receive_json()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                data = ormsgpack.unpackb(message["bytes"])
+            else:
+                data = orjson.loads(message["text"])
             await handle_message(data, websocket)
             
     except WebSocketDisconnect:
-        active_connections.discard(websocket)
+        pass
     except Exception as e:
-        print(f"WebSocket error: {e}")
-        active_connections.discard(websocket)
+        logger.warning("WebSocket error: %s", e)
+    finally:
+        sim.remove_channel(websocket)
+        channel.relay_task.cancel()
 
 
 async def handle_message(data: dict, websocket: WebSocket):
     """Handle incoming WebSocket messages."""
-    global simulation_model, simulation_running, simulation_paused, simulation_speed
+    sim = app.state.sim
     
     msg_type = data.get("type")
     
     if msg_type == "start":
         scenario = data.get("scenario", "scenario_1_simple")
-        simulation_speed = data.get("speed", 2.0)
         
         # Create new simulation from scenario config
         scenario_config = get_scenario(scenario)
@@ -82,7 +249,7 @@ async def handle_message(data: dict, websocket: WebSocket):
             from agents.tit_for_tat_vehicle import TitForTatVehicle
             
             # Create model with TFT orchestrator
-            simulation_model = ChargingSimulationModel(
+            sim.model = ChargingSimulationModel(
                 grid=scenario_config.grid,
                 initial_vehicle_positions=[],  # Will add vehicles manually
                 initial_battery_levels=[],
@@ -101,18 +268,18 @@ async def handle_message(data: dict, websocket: WebSocket):
                 
                 vehicle = TitForTatVehicle(
                     unique_id=vehicle_id,
-                    model=simulation_model,
+                    model=sim.model,
                     position=pos,
                     battery_level=battery,
                     strategy=strategy
                 )
                 
-                simulation_model.vehicles[vehicle_id] = vehicle
-                simulation_model.schedule.add(vehicle)
-                simulation_model._vehicle_counter += 1
+                sim.model.vehicles[vehicle_id] = vehicle
+                sim.model.schedule.add(vehicle)
+                sim.model._vehicle_counter += 1
                 
                 # Log strategy assignment
-                simulation_model.log_activity(
+                sim.model.log_activity(
                     vehicle_id,
                     f"Initialized with {strategy.upper()} strategy",
                     "info"
@@ -122,7 +289,7 @@ async def handle_message(data: dict, websocket: WebSocket):
             from agents.negotiating_orchestrator import NegotiatingOrchestrator
             from agents.negotiating_vehicle import NegotiatingVehicle
             
-            simulation_model = ChargingSimulationModel(
+            sim.model = ChargingSimulationModel(
                 grid=scenario_config.grid,
                 initial_vehicle_positions=scenario_config.vehicle_positions,
                 initial_battery_levels=scenario_config.vehicle_batteries,
@@ -133,8 +300,10 @@ async def handle_message(data: dict, websocket: WebSocket):
                 vehicle_class=NegotiatingVehicle
             )
         
-        simulation_running = True
-        simulation_paused = False
+        sim.apply_speed(data.get("speed", sim.speed))
+        sim.running = True
+        sim.resume_event.set()
+        sim.last_state = None  # New model: clients need a full snapshot
         
         # Start simulation loop
         asyncio.create_task(run_simulation())
@@ -143,10 +312,10 @@ async def handle_message(data: dict, websocket: WebSocket):
         await broadcast_state()
         
     elif msg_type == "pause":
-        simulation_paused = True
+        sim.resume_event.clear()
         
     elif msg_type == "resume":
-        simulation_paused = False
+        sim.resume_event.set()
         
     elif msg_type == "reset":
         scenario = data.get("scenario", "scenario_1_simple")
@@ -158,7 +327,7 @@ async def handle_message(data: dict, websocket: WebSocket):
             from agents.tit_for_tat_orchestrator import TitForTatOrchestrator
             from agents.tit_for_tat_vehicle import TitForTatVehicle
             
-            simulation_model = ChargingSimulationModel(
+            sim.model = ChargingSimulationModel(
                 grid=scenario_config.grid,
                 initial_vehicle_positions=[],
                 initial_battery_levels=[],
@@ -177,21 +346,21 @@ async def handle_message(data: dict, websocket: WebSocket):
                 
                 vehicle = TitForTatVehicle(
                     unique_id=vehicle_id,
-                    model=simulation_model,
+                    model=sim.model,
                     position=pos,
                     battery_level=battery,
                     strategy=strategy
                 )
                 
-                simulation_model.vehicles[vehicle_id] = vehicle
-                simulation_model.schedule.add(vehicle)
-                simulation_model._vehicle_counter += 1
+                sim.model.vehicles[vehicle_id] = vehicle
+                sim.model.schedule.add(vehicle)
+                sim.model._vehicle_counter += 1
         else:
             # Use negotiating agents by default for all other scenarios
             from agents.negotiating_orchestrator import NegotiatingOrchestrator
             from agents.negotiating_vehicle import NegotiatingVehicle
             
-            simulation_model = ChargingSimulationModel(
+            sim.model = ChargingSimulationModel(
                 grid=scenario_config.grid,
                 initial_vehicle_positions=scenario_config.vehicle_positions,
                 initial_battery_levels=scenario_config.vehicle_batteries,
@@ -202,873 +371,272 @@ async def handle_message(data: dict, websocket: WebSocket):
                 vehicle_class=NegotiatingVehicle
             )
         
-        simulation_running = False
-        simulation_paused = False
-        await broadcast_state()
-        simulation_paused = False
+        sim.apply_speed(sim.speed)
+        sim.running = False
+        sim.resume_event.set()  # Wakes a paused loop so it sees sim.running and exits
+        sim.last_state = None  # New model: clients need a full snapshot
         await broadcast_state()
         
+    elif msg_type == "batch":
+        # Several control messages the client sent together, handled in order; batches don't nest
+        messages = data.get("msgs", [])
+        if not isinstance(messages, list):
+            logger.warning("Ignoring WebSocket batch whose msgs is not a list")
+            return
+        if any(isinstance(message, dict) and message.get("type") == "batch" for message in messages):
+            logger.warning("Ignoring WebSocket batch with a nested batch")
+            return
+        for message in messages:
+            if not isinstance(message, dict):
+                logger.warning("Ignoring non-object entry in WebSocket batch: %r", message)
+                continue
+            await handle_message(message, websocket)
+        
     elif msg_type == "set_speed":
-        simulation_speed = data.get("speed", 2.0)
+        sim.apply_speed(data.get("speed", 1.0))  # Picked up by the next tick
+        
+    elif msg_type == "resync_request":
+        # Client saw a gap in frame sequence numbers: resend the full state
+        channel = sim.connections.get(websocket)
+        if channel:
+            if sim.last_state is not None:
+                channel.reset_to(sim.current_snapshot())
+            else:
+                channel.needs_snapshot = True
         
     elif msg_type == "add_vehicle":
-        if simulation_model:
+        if sim.model:
             x = data.get("x", 1)
             y = data.get("y", 1)
             battery = data.get("battery", 50.0)
-            simulation_model.add_vehicle((x, y), battery)
+            async with sim.model_lock:
+                sim.model.add_vehicle((x, y), battery)
             await broadcast_state()
 
 
 async def run_simulation():
     """Main simulation loop."""
-    global simulation_running, simulation_paused
+    sim = app.state.sim
+    
+    # Pace ticks against a monotonic deadline so step/broadcast time doesn't add drift
+    loop = asyncio.get_running_loop()
+    next_deadline = loop.time()
     
-    while simulation_running:
-        if not simulation_paused and simulation_model:
+    while sim.running:
+        # Paused: sleep until resumed instead of polling, then restart the schedule
+        if not sim.resume_event.is_set():
+            await sim.resume_event.wait()
+            next_deadline = loop.time()
+            continue
+        
+        if sim.model:
             try:
-                # Step the simulation
-                simulation_model.step()
+                # Step the simulation in a worker thread so WebSocket I/O keeps flowing meanwhile
+                async with sim.model_lock:
+                    await loop.run_in_executor(None, sim.model.step)
                 
-                # Broadcast state IMMEDIATELY after each step
-                await broadcast_state()
+                # Broadcast state IMMEDIATELY after each step (dropped if every client is still busy)
+                await broadcast_state(droppable=True)
                 
             except Exception as e:
-                print(f"Simulation error: {e}")
-                import traceback
-                traceback.print_exc()
-                simulation_running = False
+                logger.exception("Simulation error: %s", e)
+                sim.running = False
         
         # Use the scenario's step delay for better observation
-        if simulation_model and hasattr(simulation_model, 'step_delay'):
-            await asyncio.sleep(simulation_model.step_delay)
-        else:
-            await asyncio.sleep(0.3)  # Default delay
+        next_deadline += sim.step_delay
+        
+        remaining = next_deadline - loop.time()
+        if remaining < 0:
+            # Behind schedule: start over from now instead of bursting to catch up
+            logger.debug("Simulation tick overran its step delay by %.3fs", -remaining)
+            next_deadline = loop.time()
+            remaining = 0
+        await asyncio.sleep(remaining)
 
 
-async def broadcast_state():
-    """Broadcast current state to all connected clients."""
-    if not simulation_model:
-        return
+def encode_state(state: dict) -> bytes:
+    """Serialize a simulation state dict to a zlib-compressed MessagePack frame."""
+    return zlib.compress(ormsgpack.packb(state, option=STATE_PACK_OPTIONS), FRAME_COMPRESS_LEVEL)
+
+
+def encode_snapshot(state: dict, seq: int) -> bytes:
+    """Encode a full-state frame."""
+    return encode_state({'type': 'snapshot', 'seq': seq, 'state': state})
+
+
+def copy_state(state: dict) -> dict:
+    """Copy a state dict, detaching the lists and dicts the model reuses between ticks.
+
+    Trails come back from the model as deques; the copy turns them into plain lists for encoding.
+    """
+    copied = dict(state)
+    copied['logs'] = list(state['logs'])
+    copied['stations'] = [dict(station) for station in state['stations']]
+    copied['vehicles'] = [
+        {**v, 'trail': list(v['trail']), 'current_path': list(v['current_path'])}
+        for v in state['vehicles']
+    ]
+    return copied
+
+
+def trail_delta(prev: list, trail: list) -> Tuple[int, list]:
+    """
+    Describe how a bounded trail moved on since prev.
     
-    state = simulation_model.get_state()
+    Returns:
+        (drop, append): points to drop from the front of prev and points to append
+    """
+    for drop in range(len(prev) + 1):
+        kept = len(prev) - drop
+        if trail[:kept] == prev[drop:]:
+            return drop, trail[kept:]
+    return len(prev), trail
+
+
+def diff_vehicle(prev: dict, vehicle: dict) -> dict:
+    """Changed fields of one vehicle; empty if nothing changed."""
+    changes = {
+        key: value for key, value in vehicle.items()
+        if key != 'trail' and prev.get(key) != value
+    }
+    drop, append = trail_delta(prev['trail'], vehicle['trail'])
+    if drop or append:
+        changes['trail_drop'] = drop
+        changes['trail_append'] = append
+    if changes:
+        changes['id'] = vehicle['id']
+    return changes
+
+
+def metrics_changed(prev: dict, metrics: dict) -> bool:
+    """True if metrics differ from prev in anything other than VOLATILE_METRICS."""
+    return any(
+        prev.get(key) != value
+        for key, value in metrics.items() if key not in VOLATILE_METRICS
+    )
+
+
+def diff_state(prev: dict, state: dict, include_volatile: bool = False) -> Optional[dict]:
+    """
+    Build a patch frame that turns prev into state.
     
-    # Send to all connected clients
-    disconnected = set()
-    for ws in active_connections:
-        try:
-            await ws.send_json(state)
-        except Exception:
-            disconnected.add(ws)
+    Top-level fields are sent only when they changed, vehicles are diffed by id
+    (new vehicles are sent whole) and logs are the entries newer than prev's.
+    Changes limited to VOLATILE_FIELDS / VOLATILE_METRICS don't count as a change
+    unless include_volatile is set.
+    
+    Returns:
+        Patch frame, or None if nothing changed
+    """
+    changed = {
+        key: value for key, value in state.items()
+        if key not in ('vehicles', 'logs') and prev.get(key) != value
+    }
+    # Logs accumulate until the next step, so a second broadcast in one tick repeats them
+    last_log_seq = prev['logs'][-1]['seq'] if prev['logs'] else 0
+    new_logs = [log for log in state['logs'] if log['seq'] > last_log_seq]
+    if new_logs:
+        changed['logs'] = new_logs
+    
+    prev_vehicles = {v['id']: v for v in prev['vehicles']}
+    vehicle_patches = []
+    for vehicle in state['vehicles']:
+        if vehicle['id'] in prev_vehicles:
+            changes = diff_vehicle(prev_vehicles.pop(vehicle['id']), vehicle)
+        else:
+            changes = vehicle
+        if changes:
+            vehicle_patches.append(changes)
+    removed = list(prev_vehicles)
     
-    # Remove disconnected clients
-    active_connections.difference_update(disconnected)
+    significant = set(changed)
+    if not include_volatile:
+        significant -= VOLATILE_FIELDS
+        if 'metrics_summary' in changed and not metrics_changed(prev['metrics_summary'], state['metrics_summary']):
+            significant.discard('metrics_summary')
+    if not (significant or vehicle_patches or removed):
+        return None
+    
+    patch = {'type': 'patch', 'state': changed}
+    if vehicle_patches:
+        patch['vehicles'] = vehicle_patches
+    if removed:
+        patch['removed'] = removed
+    return patch
 
 
-# HTML Template with Canvas Visualization
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Multi-Robot Charging Simulation</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: #0a0a0a;
-            color: #e0e0e0;
-            overflow: hidden;
-        }
-        
-        .container {
-            display: grid;
-            grid-template-columns: 300px 1fr 350px;
-            height: 100vh;
-            gap: 0;
-        }
-        
-        /* Logs Section - Left Sidebar */
-        .logs-section {
-            background: #1a1a1a;
-            border-right: 2px solid #333;
-            padding: 15px;
-            overflow-y: auto;
-            display: flex;
-            flex-direction: column;
-        }
-        
-        .logs-title {
-            font-size: 14px;
-            font-weight: bold;
-            color: #4fc3f7;
-            margin-bottom: 12px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        .log-entry {
-            font-family: 'Consolas', 'Monaco', monospace;
-            font-size: 11px;
-            padding: 6px 10px;
-            margin: 3px 0;
-            border-left: 3px solid transparent;
-            background: rgba(255,255,255,0.03);
-            border-radius: 3px;
-            line-height: 1.4;
-        }
-        
-        .log-orchestrator {
-            border-left-color: #4fc3f7;
-        }
-        
-        .log-vehicle {
-            border-left-color: #ffd43b;
-        }
-        
-        .log-vehicle-0 {
-            border-left-color: #ffd43b;
-        }
-        
-        .log-vehicle-1 {
-            border-left-color: #51cf66;
-        }
-        
-        .log-vehicle-2 {
-            border-left-color: #ff6b9d;
-        }
-        
-        .log-system {
-            border-left-color: #9c27b0;
-        }
-        
-        .log-timestamp {
-            color: #666;
-            margin-right: 6px;
-        }
-        
-        .log-agent {
-            font-weight: bold;
-            margin-right: 6px;
-        }
-        
-        .log-orchestrator .log-agent {
-            color: #4fc3f7;
-        }
-        
-        .log-vehicle .log-agent {
-            color: #ffd43b;
-        }
-        
-        .log-vehicle-0 .log-agent {
-            color: #ffd43b;
-        }
-        
-        .log-vehicle-1 .log-agent {
-            color: #51cf66;
-        }
-        
-        .log-vehicle-2 .log-agent {
-            color: #ff6b9d;
-        }
-        
-        .log-system .log-agent {
-            color: #9c27b0;
-        }
-        
-        .log-system .log-agent {
-            color: #9c27b0;
-        }
-        
-        .log-action { color: #51cf66; }
-        .log-warning { color: #ff9800; }
-        .log-error { color: #ff6b6b; }
-        
-        /* Canvas Area - Center */
-        .canvas-area {
-            background: #000;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            padding: 20px;
-            position: relative;
-            overflow: auto;
-        }
-        
-        #simulationCanvas {
-            border: 2px solid #4fc3f7;
-            box-shadow: 0 0 20px rgba(79, 195, 247, 0.3);
-            image-rendering: pixelated;
-        }
-        
-        .canvas-legend {
-            position: absolute;
-            top: 30px;
-            right: 30px;
-            background: rgba(0,0,0,0.8);
-            padding: 15px;
-            border-radius: 8px;
-            border: 1px solid #333;
-        }
-        
-        .legend-title {
-            font-size: 12px;
-            font-weight: bold;
-            color: #4fc3f7;
-            margin-bottom: 10px;
-        }
-        
-        .legend-item {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            margin: 6px 0;
-            font-size: 11px;
-        }
-        
-        .legend-color {
-            width: 20px;
-            height: 20px;
-            border-radius: 3px;
-        }
-        
-        /* Control Panel - Right Sidebar */
-        .control-panel {
-            background: #1a1a1a;
-            border-left: 2px solid #333;
-            padding: 20px;
-            overflow-y: auto;
-            display: flex;
-            flex-direction: column;
-            gap: 20px;
-        }
-        
-        .panel-section {
-            background: #252525;
-            padding: 15px;
-            border-radius: 8px;
-            border: 1px solid #333;
-        }
-        
-        .section-title {
-            font-size: 13px;
-            font-weight: bold;
-            color: #4fc3f7;
-            margin-bottom: 12px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        /* Controls */
-        .control-group {
-            margin-bottom: 12px;
-        }
-        
-        label {
-            display: block;
-            font-size: 11px;
-            color: #aaa;
-            margin-bottom: 5px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-        
-        select, input[type="number"] {
-            width: 100%;
-            padding: 8px;
-            background: #1a1a1a;
-            border: 1px solid #444;
-            border-radius: 4px;
-            color: #fff;
-            font-size: 12px;
-        }
-        
-        input[type="range"] {
-            width: 100%;
-        }
-        
-        button {
-            width: 100%;
-            padding: 10px;
-            margin: 5px 0;
-            border: none;
-            border-radius: 4px;
-            font-size: 12px;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.3s;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        .btn-start {
-            background: linear-gradient(135deg, #51cf66, #40c057);
-            color: #fff;
-        }
-        
-        .btn-pause {
-            background: linear-gradient(135deg, #ffd43b, #ffa94d);
-            color: #000;
-        }
-        
-        .btn-reset {
-            background: linear-gradient(135deg, #ff6b6b, #ff5252);
-            color: #fff;
-        }
-        
-        button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-        }
-        
-        button:disabled {
-            opacity: 0.5;
-            cursor: not-allowed;
-            transform: none;
-        }
-        
-        /* Status Grid */
-        .status-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 10px;
-        }
-        
-        .status-item {
-            background: #1a1a1a;
-            padding: 10px;
-            border-radius: 4px;
-            text-align: center;
-        }
-        
-        .status-label {
-            font-size: 10px;
-            color: #888;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-        
-        .status-value {
-            font-size: 20px;
-            font-weight: bold;
-            color: #4fc3f7;
-            margin-top: 5px;
-        }
-        
-        /* Vehicles List - Compact */
-        .entity-list {
-            display: flex;
-            flex-direction: column;
-            gap: 8px;
-            max-height: 250px;
-            overflow-y: auto;
-        }
-        
-        .vehicle-card {
-            background: #1a1a1a;
-            padding: 10px;
-            border-radius: 4px;
-            border-left: 3px solid #ffd43b;
-        }
-        
-        .station-card {
-            background: #1a1a1a;
-            padding: 10px;
-            border-radius: 4px;
-            border-left: 3px solid #51cf66;
-        }
-        
-        .entity-header {
-            font-size: 12px;
-            font-weight: bold;
-            margin-bottom: 6px;
-        }
-        
-        .entity-info {
-            font-size: 10px;
-            color: #aaa;
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 4px;
-        }
-        
-        .battery-bar {
-            height: 4px;
-            background: #333;
-            border-radius: 2px;
-            margin-top: 6px;
-            overflow: hidden;
-        }
-        
-        .battery-fill {
-            height: 100%;
-            transition: width 0.3s;
-        }
-        
-        .battery-high { background: #51cf66; }
-        .battery-medium { background: #ffd43b; }
-        .battery-low { background: #ff6b6b; }
-        
-        /* Scrollbar */
-        ::-webkit-scrollbar {
-            width: 8px;
-            height: 8px;
-        }
-        
-        ::-webkit-scrollbar-track {
-            background: #1a1a1a;
-        }
-        
-        ::-webkit-scrollbar-thumb {
-            background: #444;
-            border-radius: 4px;
-        }
-        
-        ::-webkit-scrollbar-thumb:hover {
-            background: #555;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <!-- Left: Agent Logs -->
-        <div class="logs-section">
-            <div class="logs-title">Agent Activity</div>
-            <div id="logsList"></div>
-        </div>
-        
-        <!-- Center: Canvas Visualization -->
-        <div class="canvas-area">
-            <canvas id="simulationCanvas"></canvas>
-            
-            <!-- Legend -->
-            <div class="canvas-legend" id="canvasLegend">
-                <div class="legend-title">Legend</div>
-            </div>
-        </div>
-        
-        <!-- Right: Control Panel -->
-        <div class="control-panel">
-            <!-- Scenario Description -->
-            <div class="panel-section" id="scenarioDescription" style="display: none;">
-                <div class="section-title">Scenario Info</div>
-                <div style="font-size: 11px; color: #ccc; line-height: 1.6; max-height: 300px; overflow-y: auto; white-space: pre-line;" id="scenarioDescText"></div>
-            </div>
-            
-            <!-- Controls -->
-            <div class="panel-section">
-                <div class="section-title">Controls</div>
-                
-                <div class="control-group">
-                    <label>Scenario</label>
-                    <select id="scenario">
-                        <option value="scenario_1_simple">Scenario 1: Standard - Simple 1 Agent</option>
-                        <option value="scenario_2_multiple">Scenario 2: Multiple Agents - Concurrent</option>
-                        <option value="scenario_3_conflict">Scenario 3: Path Conflict - Head-On Avoidance</option>
-                        <option value="scenario_4_contention">Scenario 4: Station Contention - Resource Allocation</option>
-                        <option value="scenario_5_negotiation">Scenario 5: Assignment Negotiation</option>
-                        <option value="scenario_6_tit_for_tat">Scenario 6: Tit-for-Tat Behavioral Learning</option>
-                    </select>
-                </div>
-                
-                <button id="startBtn" class="btn-start">Start</button>
-                <button id="pauseBtn" class="btn-pause" disabled>Pause</button>
-                <button id="resetBtn" class="btn-reset">Reset</button>
-            </div>
-                
-                <!-- Status -->
-                <div class="panel-section">
-                    <div class="section-title">Status</div>
-                    <div class="status-grid">
-                        <div class="status-item">
-                            <div class="status-label">Tick</div>
-                            <div class="status-value" id="tick">0</div>
-                        </div>
-                        <div class="status-item">
-                            <div class="status-label">Vehicles</div>
-                            <div class="status-value" id="vehicleCount">0</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Vehicles -->
-                <div class="panel-section">
-                    <div class="section-title">Vehicles</div>
-                    <div class="entity-list" id="vehiclesList"></div>
-                </div>
-                
-                <!-- Stations -->
-                <div class="panel-section">
-                    <div class="section-title">Charging Stations</div>
-                    <div class="entity-list" id="stationsList"></div>
-                </div>
-            </div>
-        </div>
-    </div>
+async def broadcast_state(droppable: bool = False):
+    """
+    Broadcast current state to all connected clients.
     
-    <script>
-        // Global state
-        let ws = null;
-        let isPaused = false;
-        const logs = [];
-        // Unlimited logs - removed maxLogs limit to show full negotiation history
-        
-        // Canvas
-        const canvas = document.getElementById('simulationCanvas');
-        const ctx = canvas.getContext('2d');
-        const cellSize = 25;
-        
-        // UI Elements
-        const logsListEl = document.getElementById('logsList');
-        const tickEl = document.getElementById('tick');
-        const vehicleCountEl = document.getElementById('vehicleCount');
-        const vehiclesListEl = document.getElementById('vehiclesList');
-        const stationsListEl = document.getElementById('stationsList');
-        const connectionStatusEl = document.getElementById('connectionStatus');
-        
-        const scenarioSelect = document.getElementById('scenario');
-        const startBtn = document.getElementById('startBtn');
-        const pauseBtn = document.getElementById('pauseBtn');
-        const resetBtn = document.getElementById('resetBtn');
-        
-        // WebSocket Connection
-        function connect() {
-            ws = new WebSocket(`ws://${window.location.host}/ws`);
-            
-            ws.onopen = () => {
-                console.log('WebSocket connected');
-            };
-            
-            ws.onmessage = (event) => {
-                const state = JSON.parse(event.data);
-                updateVisualization(state);
-            };
-            
-            ws.onclose = () => {
-                console.log('WebSocket disconnected');
-                setTimeout(connect, 2000);
-            };
-            
-            ws.onerror = (error) => {
-                console.error('WebSocket error:', error);
-            };
-        }
-        
-        function send(message) {
-            if (ws && ws.readyState === WebSocket.OPEN) {
-                ws.send(JSON.stringify(message));
-            }
-        }
-        
-        // Visualization
-        function updateVisualization(state) {
-            // Process logs - show in order (newest at bottom)
-            if (state.logs && state.logs.length > 0) {
-                state.logs.forEach(log => {
-                    addLog(state.tick, log.agent, log.message, log.type);
-                });
-            }
-            
-            // Draw canvas
-            drawSimulation(state);
-            
-            // Update legend based on current scenario
-            updateLegend(state);
-            
-            // Update scenario info
-            if (state.scenario_name) {
-                document.getElementById('scenarioDescription').style.display = 'block';
-                document.getElementById('scenarioDescText').textContent = state.scenario_description || '';
-            }
-            
-            // Update UI
-            tickEl.textContent = state.tick;
-            vehicleCountEl.textContent = state.vehicles.length;
-            
-            // Update vehicles list
-            vehiclesListEl.innerHTML = state.vehicles.map(v => {
-                const batteryClass = v.battery_level > 60 ? 'battery-high' : 
-                                    v.battery_level > 30 ? 'battery-medium' : 'battery-low';
-                return `
-                    <div class="vehicle-card">
-                        <div class="entity-header" style="color: #ffd43b;">${v.id}</div>
-                        <div class="entity-info">
-                            <span>Pos: (${v.position[0]},${v.position[1]})</span>
-                            <span>Status: ${v.status}</span>
-                            <span>Battery: ${v.battery_level.toFixed(1)}%</span>
-                            ${v.target_station !== null ? `<span>→ Station ${v.target_station}</span>` : '<span>-</span>'}
-                        </div>
-                        <div class="battery-bar">
-                            <div class="battery-fill ${batteryClass}" style="width: ${v.battery_level}%"></div>
-                        </div>
-                    </div>
-                `;
-            }).join('');
-            
-            // Update stations
-            stationsListEl.innerHTML = state.stations.map(s => `
-                <div class="station-card">
-                    <div class="entity-header" style="color: #51cf66;">Station ${s.id}</div>
-                    <div class="entity-info">
-                        <span>Pos: (${s.position[0]},${s.position[1]})</span>
-                        <span>Load: ${(s.load * 100).toFixed(0)}%</span>
-                        <span>Occupied: ${s.occupied}/${s.capacity}</span>
-                    </div>
-                </div>
-            `).join('');
-        }
-        
-        function drawSimulation(state) {
-            // Parse grid
-            const lines = state.grid_string.split('\\n');
-            const gridHeight = lines.length;
-            const gridWidth = lines[0] ? lines[0].length : 0;
-            
-            // Resize canvas
-            canvas.width = gridWidth * cellSize;
-            canvas.height = gridHeight * cellSize;
-            
-            // Clear
-            ctx.fillStyle = '#000';
-            ctx.fillRect(0, 0, canvas.width, canvas.height);
-            
-            // Draw grid cells
-            for (let y = 0; y < gridHeight; y++) {
-                for (let x = 0; x < gridWidth; x++) {
-                    const char = lines[y][x];
-                    const px = x * cellSize;
-                    const py = y * cellSize;
-                    
-                    // Cell background
-                    if (char === '#') {
-                        ctx.fillStyle = '#ff6b6b';
-                        ctx.fillRect(px, py, cellSize, cellSize);
-                    } else if (char === 'C') {
-                        ctx.fillStyle = '#51cf66';
-                        ctx.fillRect(px, py, cellSize, cellSize);
-                    } else {
-                        ctx.fillStyle = '#1a1a1a';
-                        ctx.fillRect(px, py, cellSize, cellSize);
-                    }
-                    
-                    // Grid lines
-                    ctx.strokeStyle = '#333';
-                    ctx.lineWidth = 1;
-                    ctx.strokeRect(px, py, cellSize, cellSize);
-                }
-            }
-            
-            // Draw exit if exists
-            if (state.grid_exit) {
-                const [ex, ey] = state.grid_exit;
-                ctx.fillStyle = 'rgba(33, 150, 243, 0.3)';
-                ctx.fillRect(ex * cellSize, ey * cellSize, cellSize, cellSize);
-                ctx.strokeStyle = '#2196F3';
-                ctx.lineWidth = 2;
-                ctx.strokeRect(ex * cellSize, ey * cellSize, cellSize, cellSize);
-            }
-            
-            // Draw trails and paths for each vehicle
-            state.vehicles.forEach((v, idx) => {
-                // Vehicle-specific colors
-                const vehicleColors = [
-                    { main: '#ffd43b', trail: 'rgba(255, 212, 59, 0.5)', path: 'rgba(255, 212, 59, 0.7)' },  // Yellow
-                    { main: '#51cf66', trail: 'rgba(81, 207, 102, 0.5)', path: 'rgba(81, 207, 102, 0.7)' },  // Green
-                    { main: '#ff6b9d', trail: 'rgba(255, 107, 157, 0.5)', path: 'rgba(255, 107, 157, 0.7)' }  // Pink
-                ];
-                const colors = vehicleColors[idx % vehicleColors.length];
-                
-                // Draw trail (past positions)
-                if (v.trail && v.trail.length > 0) {
-                    ctx.fillStyle = colors.trail;
-                    v.trail.forEach(([x, y]) => {
-                        ctx.fillRect(x * cellSize + 5, y * cellSize + 5, cellSize - 10, cellSize - 10);
-                    });
-                }
-                
-                // Draw future path
-                if (v.current_path && v.current_path.length > 0) {
-                    // Draw path cells with background fill (like trail)
-                    ctx.fillStyle = colors.path;
-                    for (let i = v.path_index; i < v.current_path.length; i++) {
-                        const [px, py] = v.current_path[i];
-                        ctx.fillRect(px * cellSize + 5, py * cellSize + 5, cellSize - 10, cellSize - 10);
-                    }
-                }
-                
-                // Draw vehicle
-                const [vx, vy] = v.position;
-                ctx.fillStyle = colors.main;
-                ctx.fillRect(vx * cellSize + 3, vy * cellSize + 3, cellSize - 6, cellSize - 6);
-                
-                // Vehicle label
-                ctx.fillStyle = '#000';
-                ctx.font = 'bold 10px Arial';
-                ctx.textAlign = 'center';
-                ctx.textBaseline = 'middle';
-                ctx.fillText(v.id.replace('vehicle_', ''), vx * cellSize + cellSize / 2, vy * cellSize + cellSize / 2);
-            });
-        }
-        
-        function updateLegend(state) {
-            const legendEl = document.getElementById('canvasLegend');
-            
-            // Define vehicle colors
-            const vehicleColors = [
-                { color: '#ffd43b', name: 'Yellow' },
-                { color: '#51cf66', name: 'Green' },
-                { color: '#ff6b9d', name: 'Pink' },
-                { color: '#4fc3f7', name: 'Cyan' },
-                { color: '#9c27b0', name: 'Purple' },
-                { color: '#ff9800', name: 'Orange' }
-            ];
-            
-            // Build legend HTML
-            let legendHtml = '<div class="legend-title">Legend</div>';
-            
-            // Add obstacles
-            legendHtml += `
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #ff6b6b;"></div>
-                    <span>Obstacle</span>
-                </div>
-            `;
-            
-            // Add charging stations
-            legendHtml += `
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #51cf66;"></div>
-                    <span>Charging Station</span>
-                </div>
-            `;
-            
-            // Add vehicles dynamically based on actual number
-            state.vehicles.forEach((v, idx) => {
-                const colorInfo = vehicleColors[idx % vehicleColors.length];
-                const vehicleNum = v.id.split('_')[1] || idx;
-                legendHtml += `
-                    <div class="legend-item">
-                        <div class="legend-color" style="background: ${colorInfo.color};"></div>
-                        <span>Vehicle ${vehicleNum} (${colorInfo.name})</span>
-                    </div>
-                `;
-            });
-            
-            // Add exit zone if it exists
-            if (state.grid_exit) {
-                legendHtml += `
-                    <div class="legend-item">
-                        <div class="legend-color" style="background: #2196F3; opacity: 0.3;"></div>
-                        <span>Exit Zone</span>
-                    </div>
-                `;
-            }
-            
-            legendEl.innerHTML = legendHtml;
-        }
-        
-        function addLog(tick, agent, message, type = 'info') {
-            let agentClass = 'log-vehicle';
-            if (agent === 'Orchestrator') {
-                agentClass = 'log-orchestrator';
-            } else if (agent === 'System') {
-                agentClass = 'log-system';
-            } else if (agent.startsWith('vehicle_')) {
-                // Extract vehicle number and add specific class
-                const vehicleNum = agent.split('_')[1];
-                agentClass = `log-vehicle log-vehicle-${vehicleNum}`;
-            }
-            
-            const typeClass = type === 'action' ? 'log-action' : 
-                             type === 'warning' ? 'log-warning' : 
-                             type === 'error' ? 'log-error' : '';
-            
-            const logHtml = `
-                <div class="log-entry ${agentClass}" style="animation: slideIn 0.3s ease-out;">
-                    <span class="log-agent">${agent}:</span>
-                    <span class="${typeClass}">${message}</span>
-                </div>
-            `;
-            
-            // Add to end (newest at bottom)
-            logs.push(logHtml);
-            // No limit - keep all logs for full history
-            
-            logsListEl.innerHTML = logs.join('');
-            
-            // Auto-scroll to bottom (newest logs)
-            logsListEl.parentElement.scrollTop = logsListEl.parentElement.scrollHeight;
-        }
-        
-        // Add CSS animation for new logs
-        const style = document.createElement('style');
-        style.textContent = `
-            @keyframes slideIn {
-                from {
-                    opacity: 0;
-                    transform: translateX(-10px);
-                }
-                to {
-                    opacity: 1;
-                    transform: translateX(0);
-                }
-            }
-        `;
-        document.head.appendChild(style);
-        
-        // Event Listeners
-        startBtn.addEventListener('click', () => {
-            if (isPaused) {
-                send({ type: 'resume' });
-                isPaused = false;
-                pauseBtn.textContent = 'Pause';
-            } else {
-                send({ 
-                    type: 'start',
-                    scenario: scenarioSelect.value,
-                    speed: 3.0
-                });
-            }
-            startBtn.disabled = true;
-            pauseBtn.disabled = false;
-        });
-        
-        pauseBtn.addEventListener('click', () => {
-            if (isPaused) {
-                send({ type: 'resume' });
-                pauseBtn.textContent = 'Pause';
-            } else {
-                send({ type: 'pause' });
-                pauseBtn.textContent = 'Resume';
-            }
-            isPaused = !isPaused;
-        });
-        
-        resetBtn.addEventListener('click', () => {
-            send({ 
-                type: 'reset',
-                scenario: scenarioSelect.value
-            });
-            startBtn.disabled = false;
-            pauseBtn.disabled = true;
-            isPaused = false;
-            pauseBtn.textContent = 'Pause';
-            logs.length = 0;
-            logsListEl.innerHTML = '';
-        });
-        
-        // Initialize
-        connect();
-    </script>
-</body>
-</html>
-"""
+    Args:
+        droppable: Skip this state if every client still has a frame waiting to be sent
+            (the simulation loop's next tick supersedes it)
+    """
+    sim = app.state.sim
+    # Fan-out yields between batches; the lock keeps a second broadcast from overtaking it
+    async with sim.broadcast_lock:
+        await _broadcast_state(sim, droppable)
+
+
+def clients_busy(sim: SimState, state: dict) -> bool:
+    """True if every client is still sending an earlier frame and state adds no logs to it."""
+    channels = sim.channels
+    if not channels or sim.last_state is None:
+        return False
+    if any(channel.needs_snapshot or channel.queue.empty() for channel in channels):
+        return False
+    prev_logs = sim.last_state['logs']
+    last_log_seq = prev_logs[-1]['seq'] if prev_logs else 0
+    return not state['logs'] or state['logs'][-1]['seq'] <= last_log_seq
+
+
+async def _broadcast_state(sim: SimState, droppable: bool):
+    """Diff, encode and queue one frame per client; call with broadcast_lock held."""
+    if not sim.model:
+        return
+    
+    async with sim.model_lock:
+        raw_state = sim.model.get_state()  # Also records trails, so it runs every tick
+        if not sim.channels:
+            # Nobody to send to: skip the copy/diff/encode; whoever connects next gets a snapshot
+            sim.last_state = None
+            return
+        state = copy_state(raw_state)
+    if droppable and clients_busy(sim, state):
+        # last_state is kept, so the next patch is diffed against what clients actually hold
+        return
+    now = asyncio.get_running_loop().time()
+    if sim.last_state is not None:
+        refresh = now - sim.last_frame_at >= VOLATILE_REFRESH_INTERVAL
+        patch = diff_state(sim.last_state, state, include_volatile=refresh)
+        if patch is None:
+            return  # Nothing changed since the previous broadcast
+    else:
+        patch = None
+    sim.last_state = state
+    sim.seq += 1
+    sim.last_frame_at = now
+    
+    if patch is not None:
+        patch['seq'] = sim.seq
+        payload = encode_state(patch)
+    else:
+        payload = None
+    
+    # Hand the frame to each client's relay; a slow client only falls behind itself.
+    # Clients that are behind or new get a snapshot, since they missed a patch.
+    channels = sim.channels
+    for start in range(0, len(channels), BROADCAST_BATCH_SIZE):
+        if start:
+            # Many viewers: let other handlers run between batches
+            await asyncio.sleep(0)
+        for channel in channels[start:start + BROADCAST_BATCH_SIZE]:
+            if payload is None or channel.needs_snapshot or channel.queue.full():
+                channel.reset_to(sim.current_snapshot())
+            else:
+                channel.push(payload)
+
 
 if __name__ == "__main__":
     print("MULTI-ROBOT CHARGING SIMULATION - VISUAL PATH PLANNING\n")
@@ -1076,4 +644,14 @@ if __name__ == "__main__":
     print("Server will be available at: http://localhost:8000")
     print("Press Ctrl+C to stop\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
\ No newline at end of file
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        loop=SERVER_LOOP,
+        http=SERVER_HTTP,
+        ws=SERVER_WS,
+        ws_per_message_deflate=SERVER_WS_DEFLATE,
+        ws_max_size=SERVER_WS_MAX_SIZE
+    )
\ No newline at end of file